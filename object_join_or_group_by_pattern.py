@@ -57,8 +57,13 @@ bl_info = {
 #------- IMPORTS
 import bpy
 import re
+import fnmatch
+import time
+import bisect
+import sys
 
 from bpy.props import IntProperty, StringProperty, BoolProperty, EnumProperty
+from bpy.app.handlers import persistent
 
 
 
@@ -67,86 +72,158 @@ from bpy.props import IntProperty, StringProperty, BoolProperty, EnumProperty
 #show debug messages in blender console (that is the not python console!)
 debug = False#True
 
-#both independant, for the input-globals see register()!
-case_sensitive = True
-#whether to extend eventual existant selection or replace
-#was useful for including explicitely first selected objs in join
-extend_selection = False
-#extended mode/auto expansion of or at least look-through if
-#any numbering scheme can be applied to the entered pattern.
-auto_expansion_to_differently_numbered = False
+#the per-run options and state live in a JoinOrGroupRun (see CLASSES),
+#for the input-properties see register()!
 expanded_mode_after_howmanyfailedselections_to_abort = 100#kind a century :)
-
-TARGET_SCENE = 0
-originally_selected = {}
+#post import hook: the objects known after the last check (see getObjectKeys),
+#None while the hook is off
+import_hook_known_objects = None
+#set while the hook runs, as the joins themselves change the objects
+import_hook_running = False
+#name of the scene an import was noticed in, until runAfterImport is done
+import_hook_pending_scene = None
+#blender's duplicate numbering .001, .002, .. at the end of a name,
+#compiled on first use (see getDuplicateSuffix) to keep loading the addon cheap
+duplicate_suffix = None
+#characters with a special meaning, see getLiteralPrefix
+regex_special_characters = '.^$*+?{}[]\\|()'
+wildcard_special_characters = '*?['
 
 
 #------- FUNCTIONS
 #COMMAND BASE FUNCTION
 def main(context):
-    global originally_selected
-    
-    #poll already checked if in_pattern is given
-    #process the input now to expand possible '#'-shorthand
-    #to regex wildcard [1-9]+
-    processInput(context)
-    #
-    storeSelected(context)
+    #all state of this invocation, nothing is shared with other runs
+    run = startRun(context)
     #----------#
     # auto-expand analogously
     # instead of a single act function call there are
     # several - depending on the unix_pattern input
     #----------#
-    if (auto_expansion_to_differently_numbered):
-        return act_autoexpanded(context)
-    #else: no auto-expansion required: skip
-    #act accordingly to setup inputs (group or join)
-    act(context)
-    return {'FINISHED'}
+    for progress in act_stepwise(run):
+        pass
+    finishRun(run)
+    return run
+
+
+#RUN ON NEW OBJECTS
+#for importers (and the post import hook): applies the scene's settings
+#to the objects created since objects_before was taken only, e.g.
+#   objects_before = getObjectKeys()
+#   bpy.ops.import_scene.obj(filepath = ..)
+#   runOnNewObjects(bpy.context, objects_before)
+#@param scene:scene is optional, the scene whose settings and new objects to use
+def runOnNewObjects(context, objects_before, scene = None):
+    scene = scene or context.scene
+    new_names = []
+    for o in bpy.data.objects:
+        if (getObjectKey(o) not in objects_before and scene.objects.get(o.name) is not None):
+            new_names.append(o.name)
+    if debug:
+        print('running on ', len(new_names), ' new objects')
+    if (len(new_names) == 0):
+        return None
+    run = JoinOrGroupRun(context, scene, pool_names = new_names)
+    processInput(run)
+    for progress in act_stepwise(run):
+        pass
+    finishRun(run)
+    return run
+
+
+#START RUN
+def startRun(context):
+    run = JoinOrGroupRun(context)
+    #poll already checked if in_pattern is given
+    #process the input now to expand possible '#'-shorthand
+    #to regex wildcard [1-9]+
+    processInput(run)
+    #
+    storeSelected(run)
+    return run
 
 
 #PROCESS INPUT
-def processInput(context):
+def processInput(run):
     #count occurences of '#' from start index 1
-    if (context.scene.joinorgroupbypattern_in_pattern.count('#', 1) > 0):
+    run.auto_expansion = run.pattern.count('#', 1) > 0
+    if (run.auto_expansion):
         if debug:
             print("Found character '#' - thus enabling special auto"
             " recognition of other objects with equal basename, but"
             " numbered differently before duplication number (i.e."
             " .001, .002, etc.). These objects will each result in"
             " their own joined mesh or created group.")
-        global auto_expansion_to_differently_numbered
-        auto_expansion_to_differently_numbered = True
     return {'FINISHED'}
 	#pass
 
 
 #STORE SELECTED
-def storeSelected(context):
-    global originally_selected
-    global TARGET_SCENE
+def storeSelected(run):
     if debug:
         print('storing selected objects ...',
         '\n\r--------------------------')
-        print('\n\rclearing the storage dictionary')
-    originally_selected = {}
-    if (len(context.selected_objects) == 0):
+    #names only: no references that go stale when objects are joined away,
+    #objects are looked up by name when needed (bpy.data.objects.get)
+    run.originally_selected = frozenset()
+    if (run.selection_constraint == '0' and len(run.context.selected_objects) == 0):
         if debug:
             print('no selection => removing every constraint => executing in All mode')
-        bpy.data.scenes[TARGET_SCENE].joinorgroupbypattern_in_selection_constraint = '1'
+        #for this run only, the scene setting is left untouched
+        run.selection_constraint = '1'
         return {'ABORTED'}
     #else
+    run.originally_selected = frozenset(o.name for o in run.context.selected_objects)
     if debug:
-        print('refilling it')
-    for o in context.selected_objects:
-        if debug:
-            print('stored object ', o)
-        originally_selected.setdefault(o, {'obj': o})
-        
+        print('stored objects ', len(run.originally_selected))
+
+
+
+#FINISH RUN
+def finishRun(run):
+    if (run.mode == '0' and run.tidy_up):
+        #----------#
+        # tidy up - dismiss the .001, .002, .. endings if necessary,
+        # all joined objects at once
+        #----------#
+        tidyUpNames(run.results)
+    #----------#
+    # the only place the selection is touched:
+    # leave the resulting objects selected
+    #----------#
+    select_results(run)
+
+
+#STEPWISE ACTING
+#generator doing one join/group of one scene (i.e. of one bucket) per step,
+#so that callers may interleave other work, e.g. the modal operator.
+#the resulting objects of every step are collected in run.results
+#@yield tuple (steps_done, steps_total)
+def act_stepwise(run):
+    if (run.auto_expansion):
+        for progress in act_autoexpanded(run):
+            yield progress
+        return
+    #else: no auto-expansion required: skip
+    #act accordingly to setup inputs (group or join)
+    for progress in act_unexpanded(run):
+        yield progress
+
+
+#UNEXPANDED ACTING
+#generator, the matching is one step, then one step per scene (see act_stepwise)
+def act_unexpanded(run):
+    by_scene = match_by_scene(run)
+    yield (0, len(by_scene))
+    for i, (scene, scene_objects) in enumerate(by_scene):
+        run.results.extend(act_in_scene(run, scene, scene_objects))
+        yield (i + 1, len(by_scene))
 
 
 #AUTOEXPANDEDACTING
-def act_autoexpanded(context):
+#generator, yields after every bucket and scene of an expanded index
+#(see act_stepwise), the progress is counted in indices
+def act_autoexpanded(run):
     #----------#
     # auto-expand analogously
     # instead of a single act function call there are
@@ -155,20 +232,23 @@ def act_autoexpanded(context):
     if debug:
         print('Entered auto-expanded mode.',
         '\n\r--------------------------')
-    index_start = context.scene.joinorgroupbypattern_in_auto_expansion_index_start
-    index_end = context.scene.joinorgroupbypattern_in_auto_expansion_index_end
+    index_start = run.index_start
+    index_end = run.index_end
     #make it happen - multiple act calls
-    unix_pattern = context.scene.joinorgroupbypattern_in_pattern
+    unix_pattern = run.pattern
     #the '#' character is the indicator for the auto-expanded mode
     #and also shows the position of where to expand/multiply the pattern
     if (unix_pattern.find('[#]') != -1):
         if debug:
-            print('Act auto-expanded function found a [#] thus will cancel expansion.'
-                    ' #Line:', __LINE__)
-        act(context)
-        return False
+            print('Act auto-expanded function found a [#] thus will cancel expansion.')
+        for progress in act_unexpanded(run):
+            yield progress
+        return
     #else everything is fine
     unix_pattern_expansion_parts = unix_pattern.split('#')
+    #all groups created by this expansion are nested below one parent group
+    #named after the pattern part preceding the '#'
+    parent_groupname = unix_pattern_expansion_parts[0] or 'automatically_grouped_objects'
     failed_selections = 0
     for index in range(index_start, index_end + 1):
         if (failed_selections > expanded_mode_after_howmanyfailedselections_to_abort):
@@ -176,7 +256,7 @@ def act_autoexpanded(context):
                 print('Failed selection efforts: ', failed_selections)
                 print('Canceled further auto-expansion as there were no objects'
                 'for - felt - a century.')
-            return {'CANCELLED'}
+            return
         #act_try_several_amount_of_preceding_zeros (= foregoing zeros)
         #digitsleftforprecedingzeros = totaldigitcount - indexdigitcount
         #i.e. in the first looping there is no preceding zero,
@@ -184,9 +264,9 @@ def act_autoexpanded(context):
         #            third               are 2
         #     ...
         #thus the digitsTotalMax is really a maximum!
-        digits_left = int(context.scene.joinorgroupbypattern_in_a_e_digits_total_max - len(str(index)))
+        digits_left = int(run.digits_total_max - len(str(index)))
         if (digits_left < 0):
-            digits_left = 0 
+            digits_left = 0
         if debug:
             print('digits left = ', digits_left)
         #init
@@ -205,284 +285,430 @@ def act_autoexpanded(context):
             expanded_pattern = unix_pattern_expansion_parts[0] + '' + zeros_and_index + unix_pattern_expansion_parts[1]
             if debug:
                 print('expanded pattern = ', expanded_pattern)
-            selection_result = act(context, expanded_pattern)
-            if (selection_result): #and selection_result == {'FINISHED'} and len(context.selected_objects) > 0):
-                selection_success_at_least_once = True
-                #thus no failing (at least not included in terms of the 100 trials)
+            for act_result in act(run, expanded_pattern, parent_groupname):
+                if (act_result):
+                    run.results.extend(act_result)
+                    selection_success_at_least_once = True
+                    #thus no failing (at least not included in terms of the 100 trials)
+                yield (index - index_start, index_end - index_start + 1)
         #could we select objects at least once?
         if (selection_success_at_least_once != True):
             if debug:
                 print('selection failed @ index = ', index)
             failed_selections = failed_selections + 1
-    return {'FINISHED'}
+        yield (index - index_start + 1, index_end - index_start + 1)
 
 
 #ACT
+#generator, acting on one scene per step (nothing if nothing matched)
 #@param string:unix_pattern is optional
-#@return always returns True or False#selection_result
-def act(context, unix_pattern = None):
+#@param string:parent_groupname is optional, the group to nest created groups in
+#@yield list of resulting objects of the scene
+def act(run, unix_pattern = None, parent_groupname = None):
+    for scene, scene_objects in match_by_scene(run, unix_pattern):
+        yield act_in_scene(run, scene, scene_objects, parent_groupname)
+    ############
+    #act-furthermore
+    ############
+    #nothing so far ..
+    #but a smiley :) highly underestimated
+
+
+#MATCH BY SCENE
+#@return list of tuples (scene, matched objects of this scene), empty if nothing matched
+def match_by_scene(run, unix_pattern = None):
     if debug:
         print('acting ...',
         '\n\r--------------------------')
     ############
-    #preparation - selection
+    #preparation - matching
     ############
-    #resulting_ob = None
-    #ob := obMatchingPatternPrefix
-
-    #suspended but kept for revival if API changes to much
-    #for ob in bpy.scene.objects:
-    #    if (ob.name.match(self.in_pattern))
-    #        if (resulting_ob != None):
-    #            resulting_ob = ob
-    #            #continue
-    #        else:
-    #            bpy.ops.object.join()#joins all selected obj.
-
-    selection_result = make_selection(context, unix_pattern);
-    if (selection_result != {'FINISHED'}
-            or len(context.selected_objects) == 0):
+    objects = match_objects(run, unix_pattern)
+    if (len(objects) == 0):
         if debug:
-            print('selection could not be made (selected_objects = ',  len(context.selected_objects),')\n\r'
+            print('no objects matched\n\r'
             ,'This round --> ABORTED\n\r'
             'if in auto-expansion mode, then we continue.'
-            ' auto-expansion = ', auto_expansion_to_differently_numbered,
+            ' auto-expansion = ', run.auto_expansion,
             '\n\r')
-        return False#selection_result
-    #otherwise perform a action on the selection
+        return []
+    #otherwise perform a action on the matched objects
     if debug:
-        print('selection performed successfully')
+        print('matching performed successfully: ', len(objects))
+    #objects can only be joined within one scene,
+    #thus in global mode act separately per scene
+    return splitByScene(run, objects)
+
+
+#ACT IN SCENE
+#@return list of resulting objects
+def act_in_scene(run, scene, objects, parent_groupname = None):
     ############
     #decide if to group or join
     ############
-    if (context.scene.joinorgroupbypattern_in_mode == '0'):
+    if (run.mode == '0'):
         #----------#
         # join
         #----------#
-        join_own_result = join(context, unix_pattern)
-        if (not join_own_result):
+        joined_obj = join(run, objects, scene)
+        if (joined_obj is None):
             if debug:
                 print('join_own-action not correct => aborting')
-                return True#selection_result
+            return []
         #else continue
         if debug:
             print('act: own join-action successful')
-        if (context.scene.joinorgroupbypattern_in_tidyupnames):
-            #----------#
-            # tidy up - dismiss the .001, .002, .. endings if necessary
-            #----------#
-            tidyUpNames()
+        #names are tidied up for all joined objects at the end (finishRun)
+        results = [joined_obj]
     else:
         #----------#
         # group
         #----------#
-        groupname = ''
-        if (len(bpy.context.selected_objects) != 0):
-            groupname = getBaseName(context.selected_objects[0])
+        groupname = getBaseName(objects[0])
         if (not groupname or groupname is None):
             groupname = 'automatically_grouped_objects'
-        group_own_result = group(context, groupname)
+        group_own_result = group(run, groupname, objects, parent_groupname, scene)
         if (not group_own_result):
             if debug:
                 print('group (own-action-function) not successful => aborting')
-            return True#selection_result
-    return True#selection_result
-    ############
-    #act-furthermore
-    ############
-    #nothing so far ..
-    #but a smiley :) highly underestimated
-
-
-#MAKE SELECTION
-def make_selection(context, unix_pattern = None):
+            return []
+        results = objects
+    summary = run.summary.setdefault(scene.name, [0, 0])
+    summary[0] += 1
+    summary[1] += len(objects)
+    return results
+
+
+#SPLIT BY SCENE
+#@return list of tuples (scene, objects of this scene)
+def splitByScene(run, objects):
+    if (run.selection_constraint != '2'):
+        return [(run.scene, objects)]
+    #global: each object belongs to the first target scene it is linked to
+    by_scene = {}
+    for o in objects:
+        scene = run.home_scenes[o.name]
+        by_scene.setdefault(scene.name, (scene, []))[1].append(o)
+    return list(by_scene.values())
+
+
+#MATCH OBJECTS
+#@return list of the objects matching the pattern (the selection is not touched)
+def match_objects(run, unix_pattern = None):
     if debug:
-        print('make_selection at your service ...',
+        print('match_objects at your service ...',
         '\n\r--------------------------')
-    #ensure_nothing_selected() ensured by pattern param#3
-    # (= whether to extend selection or not)
-    unix_pattern = unix_pattern or context.scene.joinorgroupbypattern_in_pattern
+    unix_pattern = unix_pattern or run.pattern
     if (debug):
         print(unix_pattern)
-    #regex_to_unix_wildcards()
-    #args = {unix_pattern, case_sensitive, extend_selection}
-    bpy.ops.object.select_all(action="DESELECT")
-    selection_result = select_using_configuration(context.scene.joinorgroupbypattern_in_pattern_type, unix_pattern)
-    return selection_result
+    within_these_names = getCandidateNames(run, unix_pattern)
+    names = match_using_configuration(run, unix_pattern, within_these_names)
+    #resolve by name, objects joined away meanwhile are skipped
+    objects = []
+    for name in names:
+        obj = bpy.data.objects.get(name)
+        if (obj is not None):
+            objects.append(obj)
+    return objects
 
 
 #JOIN
-def join(context, unix_pattern):
+#@param scene:scene is optional, the scene the objects are in
+#@return the joined object or None
+def join(run, objects, scene = None):
     if (debug):
         print('joining ...')
     ############
     #make it happen
     ############
-    #convert_result = bpy.ops.object.convert(target='MESH', keep_original=False)
-    #convert individual objects so that convert->poll method not fails
-    sel_objs_buf = context.selected_objects
-    for o in sel_objs_buf:
+    scene = scene or run.scene
+    #convert individual objects as only meshes can be joined, via the data
+    #API as the convert operator works on the selected bases, not the objects
+    meshes = []
+    for o in objects:
         if (o.type != 'MESH'):
             if debug:
                 print('converting to mesh ...')
-            bpy.ops.object.select_all(action='DESELECT') #make sure nothing is selected
-            o.select = True                       #select only the curve object
-            bpy.ops.object.convert(type='MESH');         #convert it to mesh
-            o.select = False
-    
-    #bpy.ops.object.select_all(action='DESELECT')
-    selection_result = make_selection(context, unix_pattern)# or use sel_objs_buf?
+            o = convertToMesh(o, scene)
+            if (o is None):
+                continue
+            #the bases known for the scene are outdated now
+            run.bases.pop(scene.name, None)
+        meshes.append(o)
+    if (len(meshes) == 0):
+        return None
+    #the first object becomes the active one, i.e. the one remaining
+    active_obj = meshes[0]
     if debug:
-        print('selection was successful? ', selection_result)
-        print('PREVIOUSLY active_object = ', context.active_object)
-    #set active_object manually
-    bpy.data.scenes[TARGET_SCENE].objects.active = bpy.context.selected_objects[0]
-    if debug:
-        print('MANUALLY SET active_object = ', context.active_object)
-    #check if all converted properly
-    for o in sel_objs_buf:
-        if (o.type != 'MESH'):
-            print('Error: still not a mesh though converted - ', o.name)
-        #o.select = True
-    #join reselected pattern matching objects
-    join_result = bpy.ops.object.join()
+        print('active_object = ', active_obj)
+    #join pattern matching objects
+    join_result = bpy.ops.object.join(contextOverride(run.context, meshes, active_obj, scene,
+            getBases(run, scene, meshes)))
     if (join_result != {'FINISHED'}):
         if debug:
             print('joining perhaps not successful')
-        return False
+        return None
     if debug:
         print('joining successful')
-    return True
+    return active_obj
+
+
+#CONVERT TO MESH
+#replaces obj by a mesh object of the same name, place, links and settings
+#(the convert operator can not be used: 2.8+ converts the selected bases,
+#which can not be handed over from python)
+#@return the new mesh object or None if obj has no geometry to convert
+def convertToMesh(obj, scene):
+    if (obj.type not in ('CURVE', 'SURFACE', 'FONT', 'META')):
+        print('Error: can not convert to a mesh - ', obj.name)
+        return None
+    if (hasattr(bpy.data.meshes, 'new_from_object')):
+        #Blender 2.8+
+        if (scene == bpy.context.scene):
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+        else:
+            #an object of another scene (global mode) is only evaluated in
+            #the depsgraph of that scene, not in the one of the window
+            depsgraph = scene.view_layers[0].depsgraph
+            depsgraph.update()
+        mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph))
+    else:
+        mesh = obj.to_mesh(scene, True, 'PREVIEW')
+    if (mesh is None):
+        print('Error: still not a mesh though converted - ', obj.name)
+        return None
+    name = obj.name
+    mesh_obj = bpy.data.objects.new(name + '_mesh', mesh)
+    #parent first, setting it changes the parent inverse
+    mesh_obj.parent = obj.parent
+    mesh_obj.parent_type = obj.parent_type
+    mesh_obj.parent_bone = obj.parent_bone
+    mesh_obj.matrix_parent_inverse = obj.matrix_parent_inverse.copy()
+    mesh_obj.matrix_basis = obj.matrix_basis.copy()
+    #the children are placed relative to it below
+    mesh_obj.matrix_world = obj.matrix_world.copy()
+    for child in obj.children:
+        matrix_world = child.matrix_world.copy()
+        child.parent = mesh_obj
+        child.matrix_world = matrix_world
+    copyObjectSettings(obj, mesh_obj)
+    if (hasattr(obj, 'users_collection')):
+        for collection in obj.users_collection:
+            collection.objects.link(mesh_obj)
+        #hidden in the current view layer (2.8+ keeps that per view layer)
+        if (obj.hide_get()):
+            mesh_obj.hide_set(True)
+        bpy.data.objects.remove(obj, do_unlink = True)
+    else:
+        for sc in obj.users_scene:
+            sc.objects.link(mesh_obj)
+            sc.objects.unlink(obj)
+        mesh_obj.layers = obj.layers
+        for grp in obj.users_group:
+            grp.objects.link(mesh_obj)
+        bpy.data.objects.remove(obj)
+    #the name is free now
+    mesh_obj.name = name
+    return mesh_obj
+
+
+
+#what the object (not its data) carries: constraints, custom properties,
+#animation, object linked materials and visibility
+def copyObjectSettings(source, target):
+    for constraint in source.constraints:
+        copyProperties(constraint, target.constraints.new(constraint.type))
+    for key in source.keys():
+        value = source[key]
+        if (hasattr(value, 'to_dict')):
+            value = value.to_dict()
+        elif (hasattr(value, 'to_list')):
+            value = value.to_list()
+        target[key] = value
+    if (source.animation_data is not None):
+        animation_data = target.animation_data_create()
+        animation_data.action = source.animation_data.action
+        for driver in source.animation_data.drivers:
+            animation_data.drivers.from_existing(src_driver = driver)
+    for i, slot in enumerate(source.material_slots):
+        if (slot.link == 'OBJECT' and i < len(target.material_slots)):
+            target.material_slots[i].link = 'OBJECT'
+            target.material_slots[i].material = slot.material
+    for flag in ('hide', 'hide_viewport', 'hide_render', 'hide_select'):
+        if (hasattr(source, flag)):
+            setattr(target, flag, getattr(source, flag))
+
+
+
+#copies all writable properties, e.g. of a constraint to a new one of its type
+def copyProperties(source, target):
+    for prop in source.bl_rna.properties:
+        if (prop.is_readonly or prop.identifier == 'rna_type'):
+            continue
+        try:
+            setattr(target, prop.identifier, getattr(source, prop.identifier))
+        except (AttributeError, TypeError, ValueError):
+            #e.g. properties only valid in another mode
+            pass
 
 
 #GROUP
-def group(context, groupname):
+#@param list:objects the objects to link into the group (no selection needed)
+#@param string:parent_groupname is optional, nests the group below it (2.8+)
+#@param scene:scene is optional, the scene to link the group into (2.8+)
+def group(run, groupname, objects, parent_groupname = None, scene = None):
     #analoguously
     if (debug):
         print('grouping ...')
-    ############a
-    #make it happen
     ############
-    group_result = bpy.ops.group.create(name = groupname)
-    if (not group_result or group_result != {'FINISHED'}):
-        if debug:
-            print('grouping not successful, group: ', groupname)
-        return False
+    #make it happen - directly via the data API, i.e. without
+    #operator calls and hence without relying on the selection
+    ############
+    grp = getOrCreateGroup(run, scene or run.scene, groupname, parent_groupname)
+    #linking an object twice raises, so look up the members only once
+    already_linked = set(grp.objects.keys())
+    for o in objects:
+        if (o.name in already_linked):
+            continue
+        grp.objects.link(o)
+        already_linked.add(o.name)
     if debug:
-        print('grouping successful, group: ', groupname)
+        print('grouping successful, group: ', groupname, ' objects: ', len(objects))
     return True
-    #pass
+
+
+
+#HELPER - GROUP/COLLECTION LOOKUP
+#Blender 2.8+ has collections (which can be nested), before there were
+#flat groups. Both are created and filled directly via bpy.data.
+#Only groups of this run or (2.8+) children of the parent are reused, never
+#an unrelated one of the same name, e.g. of another scene in global mode.
+def getOrCreateGroup(run, scene, groupname, parent_groupname = None):
+    key = (scene.name, parent_groupname, groupname)
+    grp = run.groups.get(key)
+    if (grp is not None):
+        return grp
+    if (hasattr(bpy.data, 'collections')):
+        parent = scene.collection
+        if (parent_groupname and parent_groupname != groupname):
+            #one nesting level per '#' expansion
+            parent = getOrCreateGroup(run, scene, parent_groupname)
+        grp = parent.children.get(groupname)
+        if (grp is None):
+            #may get a .001 suffix if the name is in use, hence the run.groups
+            grp = bpy.data.collections.new(groupname)
+            parent.children.link(grp)
+    else:
+        #groups can not be nested, thus parent_groupname is ignored
+        grp = bpy.data.groups.new(groupname)
+    run.groups[key] = grp
+    return grp
 
 
 #HELPER - TIDYUPNAMES
-def tidyUpNames():
+def tidyUpNames(objects):
     if debug:
-        print('tidying up ...')
-    ############
-    #fetch active object
-    ############
-    active_obj = isThereActiveObjectThenGet()
-    if (not active_obj or active_obj is None):
-        if debug:
-            print('Aborting tidying up names because there is no active object.'
-            ' So nothing was left after the joining or grouping?')
-        return False
+        print('tidying up ...', len(objects))
     ############
     #tidy up - dismiss the .001, .002, .. endings if necessary
     ############
+    #renaming to a name in use makes blender search a free .001, .002, ..
+    #each time, thus the names are planned against all existing names first
+    existing_names = set(bpy.data.objects.keys())
+    renames = planTidyNames(objects, existing_names)
     if debug:
-        print('Object-name before refactoring: ', active_obj.name)
-    cleanname = getBaseName(active_obj)
-    if (cleanname and cleanname != active_obj.name):
-        if debug:
-            print('renaming')
-        active_obj.name = cleanname
-        if debug:
-            print('renaming *done*')
-    #debug
+        print('renaming ', len(renames), ' objects')
+    #names still held by objects of this renaming are freed first
+    new_names = set(cleanname for obj, cleanname in renames)
+    temp_index = 0
+    for obj, cleanname in renames:
+        if (obj.name in new_names):
+            temp_name = 'joinorgroupbypattern_tmp_%d' % temp_index
+            while (temp_name in existing_names):
+                temp_index += 1
+                temp_name = 'joinorgroupbypattern_tmp_%d' % temp_index
+            temp_index += 1
+            obj.name = temp_name
+    #then every object gets its final name, which is free by now
+    for obj, cleanname in renames:
+        obj.name = cleanname
     if debug:
-        print('Object-name after refactoring: ', active_obj.name)
+        print('renaming *done*')
     return True
 
 
-###############################
-# DYNAMIC SELECT FUNCTIION CALL
-# one out of the following select functions is called
-###############################
 
-def select_by_wildcards(unix_pattern): #given by blender
-    global extend_selection
-    global case_sensitive
-    
+#first the base names of all objects are determined, then each base name is
+#given to one object only: sorted by name, thus the object already carrying it
+#or else the lowest numbered one. The others, as well as those whose base name
+#belongs to another object (of existing_names), keep their name.
+#@param set:existing_names the names of all objects
+#@return list of tuples (object, new name), the new names are all unused
+def planTidyNames(objects, existing_names):
+    #the objects to rename free their current names
+    claimed = existing_names - set(o.name for o in objects)
+    renames = []
+    for cleanname, name, obj in sorted(((getBaseName(o), o.name, o) for o in objects),
+            key = lambda entry: entry[:2]):
+        #the own name is always free here: the base name is a prefix of it and
+        #thus sorted before, so nobody could have claimed it yet
+        if (not cleanname or cleanname in claimed):
+            cleanname = name
+        claimed.add(cleanname)
+        if (cleanname != name):
+            renames.append((obj, cleanname))
+    return renames
+
+
+
+#SELECT RESULTS
+#the selection is touched once at the very end only
+def select_results(run):
+    objects = run.results
     if debug:
-        print('select_by_wildcards at your service ...')
-    #select
-    selection_result = bpy.ops.object.select_pattern(
-        pattern = unix_pattern,
-        case_sensitive = case_sensitive,
-        extend = extend_selection
-    )
-    return selection_result
+        print('selecting results ...', len(objects))
+    if (not run.extend_selection):
+        for o in run.context.selected_objects:
+            setSelected(o, False)
+    #results of other scenes (global mode) can not be selected here
+    objects = [o for o in objects if run.scene.objects.get(o.name) is not None]
+    for o in objects:
+        setSelected(o, True)
+    if (len(objects) != 0):
+        setActive(run.context, objects[0])
 
 
+###############################
+# DYNAMIC MATCH FUNCTIION CALL
+# one out of the following match functions is called
+###############################
 
-def deselect_ifOriginallyNotBeenSelected(*args):
-    global originally_selected
+def match_by_wildcards(run, unix_pattern, names): #same as blender's select_pattern
     if debug:
-        print('deselect_ifOriginallyNotBeenSelected at your Service ...')
-    #only if selection constraint to selected objects only
-    if bpy.context.scene.joinorgroupbypattern_in_selection_constraint == '0':
-        if debug:
-            print('deselecting some of the objects not within the selection constraint')
-    
-        #could get expensive, so avoid it
-        for sel_o in bpy.context.selected_objects:
-            if debug:
-                print('investigating if sel_o (', sel_o, ') has been originally selected')
-            hasBeenOriginallySelected = False
-            for originally_sel_o in originally_selected:
-                if originally_sel_o.name == sel_o.name:
-                    #okay, then it was within the selection constraint -> all fine with that
-                    hasBeenOriginallySelected = True
-            if not hasBeenOriginallySelected:
-                #deselect using orig. stored obj as context is read-only
-                if debug:
-                    print('deselcting o', originally_sel_o)
-                originally_sel_o.select = False
+        print('match_by_wildcards at your service ...')
+    if (run.case_sensitive):
+        return [name for name in names if fnmatch.fnmatchcase(name, unix_pattern)]
+    #else
+    unix_pattern = unix_pattern.upper()
+    return [name for name in names if fnmatch.fnmatchcase(name.upper(), unix_pattern)]
 
 
 
-def select_by_regex(pattern):
+def match_by_regex(run, pattern, names):
     if debug:
-        print('select_by_regex at your Service ...')
-        #print(selection_pool['0'], ' == ? ', selection_pool[bpy.context.scene.joinorgroupbypattern_in_selection_constraint])
-        #print('selection_constraint = ', bpy.context.scene.joinorgroupbypattern_in_selection_constraint)
+        print('match_by_regex at your Service ...')
+        print('objects to check = ', len(names))
     #
-    within_these_objects = selection_pool[bpy.context.scene.joinorgroupbypattern_in_selection_constraint]
-    selection_pool_L = len(within_these_objects)
-    #debug
-    if debug:
-        print('selection_constraint = ',within_these_objects)
-        print('selection_pool_L = ', selection_pool_L)
-    
-    selectedAtLeastOne = False
-    for obj in within_these_objects:
+    compiled_pattern = re.compile(pattern)
+    matched = []
+    for name in names:
         if debug:
-            #print('Item ', obj, ' out of ', selection_pool_L)
-            print('does ', obj.name, ' match ', pattern)
-        if (re.match(pattern, obj.name)):
+            print('does ', name, ' match ', pattern)
+        if (compiled_pattern.match(name)):
             if debug:
-                print('matched object: ', obj.name)
-            obj.select = True
-            selectedAtLeastOne = True
-    if not selectedAtLeastOne:
-        return {'ABORTED'}
-    return {'FINISHED'}
-
-
-
-def nop(*args):
-    pass
+                print('matched object: ', name)
+            matched.append(name)
+    return matched
 
 
 
@@ -490,130 +716,296 @@ def nop(*args):
 #using predefined static configurations - has to be after function definition
 select_configurations = {
     #'wildcards'
-    '1': (select_by_wildcards, deselect_ifOriginallyNotBeenSelected)
+    '1': (match_by_wildcards,)
     #static, but extendable ( f1, f2, .. fx)
     #'regex'
-    ,'0': (select_by_regex, nop)
-}
-selection_pool = {
-    #'all objects'
-    '1': bpy.data.scenes[TARGET_SCENE].objects
-    #'selected_only'
-    ,'0': originally_selected #== bpy.context.selected_objects originally
+    ,'0': (match_by_regex,)
 }
 
 
 
 ################################
-# THIS FUNCTION HANDLES WHICH OF THE TWO SELECT PATHS IS TO BE FOLLOWED
+# THIS FUNCTION HANDLES WHICH OF THE TWO MATCH PATHS IS TO BE FOLLOWED
 # the dynamic function
 ################################
 
-def select_using_configuration(config, unix_pattern, *args, **kwargs):
+def match_using_configuration(run, unix_pattern, names):
     if debug:
-        print('select_using_configuration at your Service ...')
-    #default
-    selection_result = {'ABORTED'}
-    i = -1
-    for op in select_configurations[config]:
-        i = i + 1
+        print('match_using_configuration at your Service ...')
+    #each op narrows down the names handed over by the previous one
+    for op in select_configurations[run.pattern_type]:
         if debug:
-            print('config = ', config, ' i = ', i, 'op = ', op)
-        result = op(unix_pattern, *args, **kwargs)
-        #WITH ASTERISK SEEMS TO WORK
-        if (i == 0):
-            selection_result = result
-    return selection_result
-        
+            print('config = ', run.pattern_type, 'op = ', op)
+        names = op(run, unix_pattern, names)
+    return names
 
 
-# using dynamically buildable functions
-#def select(funcsToCall_arrOfstr, *args, **kwargs):
-#    for func in funcsToCall_arrOfstr:
-#        globals()[func](args, kwargs)
 
-#def select_callAppropriate_str(funcsToCall_str, *context, **kwregex):
-#    for func in funcsToCall_str.split():
-#        globals()[func](*context, **kwargs)
+#-------HELPER
+#one line per scene: how many buckets were joined/grouped from how many objects
+def getSummary(run):
+    if (len(run.summary) == 0):
+        return 'No objects matched.'
+    lines = []
+    for scene_name in sorted(run.summary):
+        buckets, objects = run.summary[scene_name]
+        lines.append('%s: %d %s from %d objects' % (scene_name, buckets,
+                ('joined' if run.mode == '0' else 'grouped'), objects))
+    return ', '.join(lines)
+
+
+
+#the names of the objects the influence (selection constraint) allows
+#to match, built once per run and reused for every expanded pattern
+def getSelectionPool(run):
+    if (run.pool_names is None):
+        if (run.selection_constraint == '0'):
+            #'selected_only' == bpy.context.selected_objects originally,
+            #sorted as the order of a set differs from process to process
+            #(the first object is the one kept by a join / naming the group)
+            run.pool_names = sorted(run.originally_selected)
+        elif (run.selection_constraint == '2'):
+            #'global' - one index over all objects of the target scenes,
+            #objects linked into several scenes are listed only once
+            #(built from the scenes, as o.users_scene scans all scenes)
+            for sc in run.scenes:
+                for name in sc.objects.keys():
+                    run.home_scenes.setdefault(name, sc)
+            run.pool_names = list(run.home_scenes)
+        else:
+            #'all objects'
+            run.pool_names = run.scene.objects.keys()
+    return run.pool_names
+
+
+
+#only names starting with the literal prefix of the pattern can match,
+#these are found by bisecting the sorted pool instead of trying them all
+def getCandidateNames(run, unix_pattern):
+    prefix = getLiteralPrefix(unix_pattern, run.pattern_type)
+    if (not prefix or (run.pattern_type == '1' and not run.case_sensitive)):
+        return getSelectionPool(run)
+    if (run.sorted_names is None):
+        run.sorted_names = sorted(getSelectionPool(run))
+    first = bisect.bisect_left(run.sorted_names, prefix)
+    end = bisect.bisect_left(run.sorted_names, prefix + chr(sys.maxunicode), first)
+    if debug:
+        print('prefix ', prefix, ' narrowed down to ', end - first, ' of ', len(run.sorted_names))
+    return run.sorted_names[first:end]
+
+
+
+#the part every matching name has to start with ('' if there is none),
+#e.g. '1D_LAY' for '1D_LAY#([.][0-9]*)?$'
+def getLiteralPrefix(pattern, pattern_type):
+    if (pattern_type == '1'):
+        #wildcards
+        for i, c in enumerate(pattern):
+            if (c in wildcard_special_characters):
+                return pattern[:i]
+        return pattern
+    #regex - alternatives may start differently
+    if (pattern.find('|') != -1):
+        return ''
+    prefix = ''
+    i = 0
+    if (pattern.startswith('^')):
+        i = 1
+    while (i < len(pattern)):
+        c = pattern[i]
+        if (c == '\\'):
+            #escaped special character like \. - but \d, \w, .. are classes
+            literal = pattern[i + 1:i + 2]
+            if (not literal or literal.isalnum()):
+                break
+            step = 2
+        elif (c == '[' and pattern[i + 2:i + 3] == ']' and pattern[i + 1:i + 2] not in ('', '^', '\\', ']')):
+            #single character class like [.]
+            literal = pattern[i + 1]
+            step = 3
+        elif (c in regex_special_characters):
+            break
+        else:
+            literal = c
+            step = 1
+        following = pattern[i + step:i + step + 1]
+        if (following and following in '*?{'):
+            #optional or repeated, thus not necessarily part of the name
+            break
+        prefix += literal
+        if (following == '+'):
+            break
+        i += step
+    return prefix
+
+
+
+#Blender 2.8+ replaced obj.select and scene.objects.active
+def setSelected(obj, state):
+    if (hasattr(obj, 'select_set')):
+        obj.select_set(state)
+    else:
+        obj.select = state
 
 
 
-#-------HELPER
-def isThereSelectionThenGet():
+def setActive(context, obj):
+    if (hasattr(context, 'view_layer')):
+        context.view_layer.objects.active = obj
+    else:
+        context.scene.objects.active = obj
+
+
+
+#Blender before 2.8 joins the selected bases (scene.object_bases), thus those
+#are overridden too, looked up in a per run index of the scene's bases
+#@return list of the bases of the objects or None (2.8+)
+def getBases(run, scene, objects):
+    if (not hasattr(scene, 'object_bases')):
+        return None
+    bases = run.bases.get(scene.name)
+    if (bases is None):
+        #(re)built after objects got converted, see join
+        bases = dict((base.object.name, base) for base in scene.object_bases)
+        run.bases[scene.name] = bases
+    return [bases[o.name] for o in objects]
+
+
+
+#hand the objects to an operator without changing the selection
+def contextOverride(context, objects, active_obj = None, scene = None, bases = None):
+    active_obj = active_obj or objects[0]
+    override = context.copy()
+    if (scene is not None and scene != context.scene):
+        override['scene'] = scene
+        if (hasattr(scene, 'view_layers')):
+            override['view_layer'] = scene.view_layers[0]
+    override['selected_objects'] = objects
+    override['selected_editable_objects'] = objects
+    if (bases is not None):
+        override['selected_bases'] = bases
+        override['selected_editable_bases'] = bases
+    override['active_object'] = active_obj
+    override['object'] = active_obj
+    return override
+
+
+
+#Blender 2.8+ has a status bar, before the area header was used
+def setStatusText(context, text = None):
+    if (getattr(context, 'workspace', None) is not None):
+        context.workspace.status_text_set(text)
+    elif (context.area is not None):
+        if (text is None):
+            context.area.header_text_set()
+        else:
+            context.area.header_text_set(text)
+
+
+
+#undo back to the step pushed before the run started
+def rollback():
     if debug:
-        print('isThereSelectionThenGet at your Service ...')
-    #opt. check if selection only one object (as is to be expectat after join)
-    sel = bpy.context.selected_objects
-    if (debug):
-        print('Count of objects in selection (hopefully 1): ', len(sel))
-    if (sel is None or not sel):
-        if debug:
-            print('No selection! Is there nothing left by join action? *worried*',
-            '\n\raborting renaming ...')
-        return False
-    #else make remaining object (or one out of them) active
-    bpy.data.scenes[TARGET_SCENE].objects.active = sel[0]
-    #deliver the selection
-    return sel
+        print('rolling back ...')
+    #push the current state first, so that undo returns to the state before
+    bpy.ops.ed.undo_push(message = 'Join Or Group By Pattern (cancelled)')
+    bpy.ops.ed.undo()
 
 
 
-def isThereActiveObjectThenGet():
-    if debug:
-        print('isThereActiveObjectThenGet at your Service ...')
-    
-    #get active object of context
-    active_obj = bpy.context.active_object
-    if (active_obj is None or not active_obj):
-        if debug:
-            print('No active object -',
-            ' trying to make the first object of the selection the active one.')
-        #check if selection and get
-        sel = isThereSelectionThenGet()
-        #make first object active (usually it should only be 1 object)
-        bpy.context.object.active = sel[0]
-    active_obj = bpy.context.active_object
-    if (active_obj is None or not active_obj):
-        if debug:
-            print('Still no active object! Aborting renaming ...')
-        return False
-    #deliver the active object
-    return active_obj
+def getDuplicateSuffix():
+    global duplicate_suffix
+    if (duplicate_suffix is None):
+        duplicate_suffix = re.compile('[.][0-9]{3}$')
+    return duplicate_suffix
+
 
 
 def getBaseName(obj):
     """Turn obj base name into a clean string representation."""
-    if debug:
-        print('getBaseName at your Service ...')
-    
-    obj_basename_parts = obj.name.split('.')
-    obj_basename_parts_L = len(obj_basename_parts)
-    if debug:
-        print('Last part: ', obj_basename_parts[obj_basename_parts_L - 1])
-    if (obj_basename_parts_L > 1
-    and re.match('[0-9]{3}$', obj_basename_parts[obj_basename_parts_L - 1])):
-        if debug:
-            print('determining base name')
-        #attention: last item is left intentionally
-        cleanname = ''
-        for i in range(0, obj_basename_parts_L - 1):
-            cleanname += obj_basename_parts[i]
-        #done this strange way to avoid unnecessary GUI updates
-        #as the sel.name fields in the UI may be unnecessarily updated on change ...
-        if debug:
-            print('determining *done*, determined basename: ', cleanname)
-        return cleanname
-    else:
+    #only the duplicate suffix is cut off, other dots are kept
+    match = getDuplicateSuffix().search(obj.name)
+    if (match is None):
         if debug:
             print('already tidied up *done*, basename: ', obj.name)
         return obj.name
-    
+    if debug:
+        print('determined basename: ', obj.name[:match.start()])
+    return obj.name[:match.start()]
 
 
 
 #-------------------------------------------------------------------------------
 #------- CLASSES
 
+class JoinOrGroupRun(object):
+    """State of a single invocation: the options read once from the scene, the selection constraint
+    and the indexes built for matching. Separate runs (scenes, batch runs) share nothing.
+    """
+    __slots__ = (
+        'context'               #blender context, for operator overrides
+        ,'scene'
+        ,'mode'                 #'0' join, '1' group
+        ,'pattern'
+        ,'pattern_type'         #'0' regex, '1' wildcards
+        ,'selection_constraint' #'0' selected only, '1' all, '2' global
+        ,'scenes'               #the scenes a global run processes
+        ,'tidy_up'
+        ,'index_start'
+        ,'index_end'
+        ,'digits_total_max'
+        ,'case_sensitive'
+        #whether to extend eventual existant selection or replace
+        #was useful for including explicitely first selected objs in join
+        ,'extend_selection'
+        #extended mode/auto expansion of or at least look-through if
+        #any numbering scheme can be applied to the entered pattern.
+        ,'auto_expansion'
+        ,'originally_selected'  #frozenset of object names
+        ,'pool_names'           #index, see getSelectionPool
+        ,'sorted_names'         #index, see getCandidateNames
+        ,'home_scenes'          #global mode: object name -> scene to act in
+        ,'groups'               #(scene, parent, name) -> group created/found
+        ,'bases'                #before 2.8: scene -> object name -> base
+        ,'results'              #the resulting objects of all act calls
+        ,'summary'              #scene name -> [acted buckets, objects]
+    )
+
+    #@param list:pool_names is optional, the names of the objects to process
+    #                       instead of those given by the influence setting
+    def __init__(self, context, scene = None, case_sensitive = True, extend_selection = False, pool_names = None):
+        self.context = context
+        self.scene = scene or context.scene
+        s = self.scene
+        self.mode = s.joinorgroupbypattern_in_mode
+        self.pattern_type = s.joinorgroupbypattern_in_pattern_type
+        #no pattern given => join/group every object
+        self.pattern = s.joinorgroupbypattern_in_pattern or ('*' if self.pattern_type == '1' else '.*')
+        self.selection_constraint = s.joinorgroupbypattern_in_selection_constraint
+        if (pool_names is not None):
+            #the given objects of this scene, no matter what is selected
+            self.selection_constraint = '1'
+        self.scenes = [self.scene]
+        if (self.selection_constraint == '2'):
+            self.scenes = [sc for sc in bpy.data.scenes if sc.joinorgroupbypattern_in_global_include]
+        self.tidy_up = s.joinorgroupbypattern_in_tidyupnames
+        self.index_start = s.joinorgroupbypattern_in_auto_expansion_index_start
+        self.index_end = s.joinorgroupbypattern_in_auto_expansion_index_end
+        self.digits_total_max = s.joinorgroupbypattern_in_a_e_digits_total_max
+        self.case_sensitive = case_sensitive
+        self.extend_selection = extend_selection
+        self.auto_expansion = False
+        self.originally_selected = frozenset()
+        self.pool_names = pool_names
+        self.sorted_names = None
+        self.home_scenes = {}
+        self.groups = {}
+        self.bases = {}
+        self.results = []
+        self.summary = {}
+
+
+
 class OBJECT_OT_Join_Or_Group_By_Wildcard(bpy.types.Operator):
     """Wraps attributes like regex input field content. Performs the operation, i.e. joining or grouping.
     """
@@ -630,36 +1022,132 @@ class OBJECT_OT_Join_Or_Group_By_Wildcard(bpy.types.Operator):
     #=======METHODS
     @classmethod
     def poll(cls, context):#it's the same without self (always inserted before)
-        SCENE = 0
         #check the context
         #context does not matter here
         #return context.active_object is not None
-        input_pattern = context.scene.joinorgroupbypattern_in_pattern
-        if (input_pattern != ""):
-            if (input_pattern.find('#') != -1):
-                    #and input_pattern.find('\[#\]') == -1):
-                #we're in auto-expansion mode, thus
-                #adjust other inputs to keep up integrity
-                in_auto_expansion_keep_up_integrity(context)
-                #
-                return True
-            return True
-
-        #else:
-        #if debug:
-        #    print('No pattern given. Shall join every object? Doing so.')
-        context.scene.joinorgroupbypattern_in_pattern = '*'
-        #return True
-        #recheck it, otherwise the button is deactivated, "else:" was the reason! really strange
-        #return cls.poll(context = context)
+        #no data is written here as poll also runs while drawing (and loading):
+        #an empty pattern matches every object (see JoinOrGroupRun), the
+        #auto-expansion inputs are kept consistent by their update callbacks
         return True
 
     def execute(self, context):
-        main(context)
+        run = main(context)
+        self.report({'INFO'}, getSummary(run))
         return {'FINISHED'}
 
 
 
+class OBJECT_OT_Join_Or_Group_By_Pattern_Modal(bpy.types.Operator):
+    """Same as the operation above, but processed in time slices in the background. Press Esc to cancel and roll back.
+    Meanwhile the view can be navigated, but nothing edited (as that would mix with the rollback).
+    """
+    #=======ATTRIBUTES
+    bl_idname = "object.join_or_group_by_pattern_modal"
+    bl_label = "Join or group matching objects in the background (Esc cancels)"
+    bl_context = "objectmode"
+    bl_register = True
+
+    #events passed on while running, navigating the view does not push undo steps
+    navigation_events = {'MOUSEMOVE', 'INBETWEEN_MOUSEMOVE', 'MIDDLEMOUSE',
+            'WHEELUPMOUSE', 'WHEELDOWNMOUSE', 'TRACKPADPAN', 'TRACKPADZOOM',
+            'NUMPAD_1', 'NUMPAD_2', 'NUMPAD_3', 'NUMPAD_4', 'NUMPAD_5', 'NUMPAD_6',
+            'NUMPAD_7', 'NUMPAD_8', 'NUMPAD_9', 'NUMPAD_PLUS', 'NUMPAD_MINUS'}
+
+    _timer = None
+    _steps = None
+    _run = None
+    _progress = (0, 1)
+    _started_at = 0.0
+
+    #=======METHODS
+    @classmethod
+    def poll(cls, context):
+        return OBJECT_OT_Join_Or_Group_By_Wildcard.poll(context)
+
+    def invoke(self, context, event):
+        #the state to roll back to if cancelled
+        bpy.ops.ed.undo_push(message = 'Join Or Group By Pattern (before)')
+        self._run = startRun(context)
+        self._steps = act_stepwise(self._run)
+        self._progress = (0, 1)
+        self._started_at = time.time()
+        wm = context.window_manager
+        wm.progress_begin(0, 100)
+        self._timer = wm.event_timer_add(0.01, window = context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if (event.type == 'ESC'):
+            self.cancel_and_rollback(context)
+            return {'CANCELLED'}
+        if (event.type != 'TIMER'):
+            if (event.type in self.navigation_events):
+                #keep the view usable meanwhile
+                return {'PASS_THROUGH'}
+            #everything else could push undo steps, which the rollback
+            #(undoing exactly one step) would then undo instead
+            return {'RUNNING_MODAL'}
+        #the context of invoke is not valid any more (e.g. the window's
+        #area or the view layer may have changed), operators get this one
+        self._run.context = context
+        #process as many steps as fit into the time budget, at least one
+        tick_end = time.time() + context.scene.joinorgroupbypattern_in_time_budget / 1000.0
+        try:
+            while True:
+                self._progress = next(self._steps)
+                if (time.time() >= tick_end):
+                    break
+        except StopIteration:
+            self.finish(context)
+            return {'FINISHED'}
+        except Exception as e:
+            #e.g. a RuntimeError of the join operator
+            print('Error: Join Or Group By Pattern failed - ', e)
+            self.cancel_and_rollback(context)
+            self.report({'ERROR'}, 'Join Or Group By Pattern failed and was rolled back: %s' % e)
+            return {'CANCELLED'}
+        self.show_progress(context)
+        return {'RUNNING_MODAL'}
+
+    def show_progress(self, context):
+        done, total = self._progress
+        context.window_manager.progress_update(100 * done // max(total, 1))
+        elapsed = max(time.time() - self._started_at, 0.001)
+        setStatusText(context, 'Join Or Group By Pattern: %d/%d (%.1f/s), %d results - Esc to cancel'
+                % (done, total, done / elapsed, len(self._run.results)))
+
+    def cleanup(self, context):
+        if (self._timer is None):
+            return
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        self._timer = None
+        wm.progress_end()
+        setStatusText(context)
+        self._steps = None
+
+    def finish(self, context):
+        self.cleanup(context)
+        finishRun(self._run)
+        self.report({'INFO'}, getSummary(self._run))
+        bpy.ops.ed.undo_push(message = 'Join Or Group By Pattern')
+        if debug:
+            print('finished after ', time.time() - self._started_at, 's')
+
+    def cancel_and_rollback(self, context):
+        self.cleanup(context)
+        self._run = None
+        rollback()
+
+    #called by blender when it ends the modal itself (loading a file,
+    #closing the window, ..), no undo operations may happen then
+    def cancel(self, context):
+        self.cleanup(context)
+        self._run = None
+
+
+
 
 class VIEW3D_PT_tools_joinorgroup_by_pattern(bpy.types.Panel):
     """GUI panel for properties.
@@ -720,9 +1208,18 @@ class VIEW3D_PT_tools_joinorgroup_by_pattern(bpy.types.Panel):
             print('Influence: ', s.joinorgroupbypattern_in_selection_constraint)
         if (s.joinorgroupbypattern_in_selection_constraint == '1'):
             in_influence_str = ' all'
+        elif (s.joinorgroupbypattern_in_selection_constraint == '2'):
+            in_influence_str = ' global'
         layout = self.layout
         col = layout.column(align = True)
         col.row().prop(s, 'joinorgroupbypattern_in_selection_constraint', expand = True)
+        if (s.joinorgroupbypattern_in_selection_constraint == '2'):
+            ############
+            #global - which scenes to include
+            ############
+            col = layout.column(align = True)
+            for sc in bpy.data.scenes:
+                col.row().prop(sc, 'joinorgroupbypattern_in_global_include', text = sc.name)
         
         
         #submit, trigger chosen action
@@ -730,6 +1227,14 @@ class VIEW3D_PT_tools_joinorgroup_by_pattern(bpy.types.Panel):
         label = in_mode_str + in_influence_str + " matching objects"
         row.operator('object.join_or_group_by_pattern', icon='FILE_TICK', text = label)
 
+        #the same in time slices, cancellable by Esc
+        col = layout.column(align = True)
+        col.row().prop(s, 'joinorgroupbypattern_in_time_budget')
+        col.row().operator('object.join_or_group_by_pattern_modal', icon='TIME', text = label + ' (background)')
+
+        #automatically for each import
+        layout.row().prop(s, 'joinorgroupbypattern_in_run_after_import')
+
 
 
 
@@ -778,13 +1283,180 @@ def in_auto_expansion_keep_up_integrity(context):
 
 
 
+#-------------------------------------------------------------------------------
+#------- HANDLERS - POST IMPORT
+#Blender has no general "import finished" event, thus after each update the
+#object count is compared (cheap) and only if it grew by an import the new
+#objects are determined and the scene's settings are applied to those new
+#objects - after the update, not within it (see runAfterImport).
+#Objects are told apart by identity (see getObjectKeys), not by name, as
+#objects renamed meanwhile are not new.
+@persistent
+def import_hook(scene, *args):
+    global import_hook_pending_scene
+    if (import_hook_running or import_hook_pending_scene is not None):
+        return
+    object_count = len(bpy.data.objects)
+    if (import_hook_known_objects is not None and object_count == len(import_hook_known_objects)):
+        return
+    if (import_hook_known_objects is not None and object_count > len(import_hook_known_objects)
+            and scene.joinorgroupbypattern_in_run_after_import and isAfterImport(bpy.context)):
+        if debug:
+            print('post import hook: ', object_count - len(import_hook_known_objects), ' new objects')
+        import_hook_pending_scene = scene.name
+        if (hasattr(bpy.app, 'timers')):
+            bpy.app.timers.register(runAfterImport, first_interval = 0)
+        else:
+            #no timers before 2.8
+            runAfterImport()
+        return
+    #remember the current state, also if objects were removed or added
+    #otherwise (duplicated, pasted, appended, ..)
+    rememberObjects()
+
+
+
+#the settings of the scene the import happened in are applied to the new objects
+#@return None, i.e. as a timer it runs once
+def runAfterImport():
+    global import_hook_running
+    global import_hook_pending_scene
+    scene_name = import_hook_pending_scene
+    import_hook_pending_scene = None
+    if (scene_name is None or import_hook_known_objects is None):
+        #undone, another file loaded or the hook switched off meanwhile
+        return None
+    scene = bpy.data.scenes.get(scene_name)
+    if (scene is not None):
+        import_hook_running = True
+        try:
+            runOnNewObjects(bpy.context, import_hook_known_objects, scene)
+        finally:
+            import_hook_running = False
+    rememberObjects()
+    return None
+
+
+
+#whether the last operator was an importer: File > Import operators are
+#IMPORT_*_OT_*, the built-in ones of newer versions WM_OT_*_import
+def isAfterImport(context):
+    operators = context.window_manager.operators
+    if (len(operators) == 0):
+        return False
+    idname = operators[-1].bl_idname
+    return idname.startswith('IMPORT_') or idname.endswith('_import')
+
+
+
+#undo/redo brings back or removes objects (e.g. those joined away), that is
+#no import, thus only remember the restored state
+@persistent
+def undo_hook(*args):
+    global import_hook_pending_scene
+    import_hook_pending_scene = None
+    rememberObjects()
+
+
+
+def rememberObjects():
+    global import_hook_known_objects
+    import_hook_known_objects = getObjectKeys()
+
+
+
+#a set identifying all objects, see getObjectKey
+def getObjectKeys():
+    return frozenset(getObjectKey(o) for o in bpy.data.objects)
+
+
+
+#identifies an object regardless of its name: by session_uid (2.91+) or else by pointer
+def getObjectKey(o):
+    if (hasattr(o, 'session_uid')):
+        return o.session_uid
+    return o.as_pointer()
+
+
+
+#Blender 2.8+ renamed scene_update_post
+def getUpdateHandlers():
+    if (hasattr(bpy.app.handlers, 'depsgraph_update_post')):
+        return bpy.app.handlers.depsgraph_update_post
+    return bpy.app.handlers.scene_update_post
+
+
+
+#adding/removing is by name, as running the script again (see PROCEDURAL)
+#creates new function objects while the old ones are still installed
+def addHandler(handlers, handler):
+    removeHandler(handlers, handler)
+    handlers.append(handler)
+
+
+
+def removeHandler(handlers, handler):
+    for h in list(handlers):
+        if (getattr(h, '__name__', None) == handler.__name__
+                and getattr(h, '__module__', None) == handler.__module__):
+            handlers.remove(h)
+
+
+
+#the hooks are only installed while at least one scene has it switched on
+def updateImportHook():
+    global import_hook_known_objects
+    enabled = False
+    for sc in bpy.data.scenes:
+        if (sc.joinorgroupbypattern_in_run_after_import):
+            enabled = True
+            break
+    hooks = ((getUpdateHandlers(), import_hook),
+            (bpy.app.handlers.undo_post, undo_hook),
+            (bpy.app.handlers.redo_post, undo_hook))
+    if (enabled):
+        if (import_hook_known_objects is None):
+            rememberObjects()
+        for handlers, hook in hooks:
+            if (hook not in handlers):
+                addHandler(handlers, hook)
+    else:
+        for handlers, hook in hooks:
+            removeHandler(handlers, hook)
+        import_hook_known_objects = None
+
+
+
+def callback_in_run_after_import_changed(self, context):
+    updateImportHook()
+
+
+
+@persistent
+def load_hook(*args):
+    #the loaded file may have the hook switched on or off
+    global import_hook_known_objects
+    global import_hook_pending_scene
+    import_hook_known_objects = None
+    import_hook_pending_scene = None
+    updateImportHook()
+
+
+
 #-------------------------------------------------------------------------------
 #------- GENERAL BLENDER SETUP FUNCTIONS
+#nothing in here touches bpy.data (scenes may not exist yet when loading),
+#the post import hook is set up afterwards (see register, load_hook),
+#everything expensive is built on the first operator run
+classes = (
+    OBJECT_OT_Join_Or_Group_By_Wildcard,
+    OBJECT_OT_Join_Or_Group_By_Pattern_Modal,
+    VIEW3D_PT_tools_joinorgroup_by_pattern,
+)
 
 def register():
-    bpy.utils.register_module(__name__)
-    #bpy.utils.register_class(OBJECT_OT_JoinOrGroupByWildcard)
-    #bpy.utils.register_class(VIEW3D_PT_tools_joinorgroup_by_pattern)
+    for cls in classes:
+        bpy.utils.register_class(cls)
     #bpy.types.Scene.joinorgroupbypattern_in_pattern = '1DLay#([.][0-9]+)*'
     bpy.types.Scene.joinorgroupbypattern_in_pattern = StringProperty(
         name = 'Pattern'
@@ -820,10 +1492,15 @@ def register():
         items = [
             ("0", "Selected", "")   #list-item '0'
             ,("1", "All", "")        #list-item '1'
-            #,("2", "Global", "")      #list-item '2' #TODO
+            ,("2", "Global", "")      #list-item '2' all objects of all included scenes
         ],
         default='0'
     )
+    bpy.types.Scene.joinorgroupbypattern_in_global_include = BoolProperty(
+        name = "Include in global",
+        description = "Whether the objects of this scene are processed when the influence is Global.",
+        default = True
+    )
 
 
     bpy.types.Scene.joinorgroupbypattern_in_tidyupnames = BoolProperty(
@@ -892,24 +1569,60 @@ def register():
         ,update = callback_in_a_e_digits_total_max_changed
     )
 
+    bpy.types.Scene.joinorgroupbypattern_in_run_after_import = BoolProperty(
+        name = "Run after import",
+        description = "Automatically join or group (according to the settings above) the objects"
+        " newly imported into this scene (File > Import). Only the new objects are processed.",
+        default = False,
+        update = callback_in_run_after_import_changed
+    )
+
+    addHandler(bpy.app.handlers.load_post, load_hook)
+    #when enabled in a running session the file's setting is read once
+    #registering is done (while blender starts up load_hook takes care)
+    if (hasattr(bpy.app, 'timers')):
+        bpy.app.timers.register(updateImportHook, first_interval = 0)
+    elif (hasattr(bpy.data, 'scenes')):
+        #no timers before 2.8, the data is only read if accessible
+        updateImportHook()
+
+    #background (modal) mode only
+    bpy.types.Scene.joinorgroupbypattern_in_time_budget = IntProperty(
+        name = "Time budget (ms)",
+        description = "BACKGROUND MODE: Milliseconds of processing per timer tick before the UI gets"
+        " control back. Higher values finish sooner, lower values keep the UI more responsive."
+        ,default = 50
+        ,min = 1
+        ,max = 1000
+    )
+
     #pass
 
 
 
 def unregister():
-    bpy.utils.unregister_module(__name__)
-    #bpy.utils.unregister_class(OBJECT_OT_JoinOrGroupByWildcard)
-    #bpy.utils.unregister_class(VIEW3D_PT_tools_joinorgroup_by_pattern)
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    removeHandler(bpy.app.handlers.load_post, load_hook)
+    if (hasattr(bpy.app, 'timers')):
+        for timer in (updateImportHook, runAfterImport):
+            if (bpy.app.timers.is_registered(timer)):
+                bpy.app.timers.unregister(timer)
+    removeHandler(getUpdateHandlers(), import_hook)
+    removeHandler(bpy.app.handlers.undo_post, undo_hook)
+    removeHandler(bpy.app.handlers.redo_post, undo_hook)
     #please tidy up
     del bpy.types.Scene.joinorgroupbypattern_in_mode
     del bpy.types.Scene.joinorgroupbypattern_in_pattern
     del bpy.types.Scene.joinorgroupbypattern_in_pattern_type
     del bpy.types.Scene.joinorgroupbypattern_in_selection_constraint
+    del bpy.types.Scene.joinorgroupbypattern_in_global_include
     del bpy.types.Scene.joinorgroupbypattern_in_tidyupnames
     del bpy.types.Scene.joinorgroupbypattern_in_auto_expansion_index_start
     del bpy.types.Scene.joinorgroupbypattern_in_auto_expansion_index_end
-    del bpy.types.Scene.joinorgroupbypattern_in_a_e_digits_total_min 
     del bpy.types.Scene.joinorgroupbypattern_in_a_e_digits_total_max
+    del bpy.types.Scene.joinorgroupbypattern_in_time_budget
+    del bpy.types.Scene.joinorgroupbypattern_in_run_after_import
     #pass
 
 